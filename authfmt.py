@@ -14,9 +14,17 @@ Protected special names can be added to the `config_authfmt.toml` file.
 import sys
 import os
 import tomllib
+from functools import lru_cache
 import bibtexparser as bp
 from splitnames import splitname
-from bibfmt import check_min_version, cleanup_record, _parser, _writer
+from bibfmt import (
+    check_min_version,
+    cleanup_record,
+    _parser,
+    _writer,
+    _write_bib,
+    _map_files,
+)
 
 
 def split_names_to_strs(names: str) -> list[str]:
@@ -27,37 +35,34 @@ def split_names_to_strs(names: str) -> list[str]:
 
 
 def format_first_name(name: str) -> str:
-    if len(name) > 2 and not name.startswith("{\\"):
-        name = f"{name[0]}."
+    if len(name) > 2 and not (name[0] == "{" and name[1] == "\\"):
+        return name[0] + "."
     return name
 
 
 def format_name_dict(name: dict) -> dict:
     """
     Format name reprented as a dictionary.
+
+    The given dictionary is not modified.
     """
     if "first" in name:
         first_name = " ".join(name["first"])
-        name["first"] = [format_first_name(first_name)]
+        name = {**name, "first": [format_first_name(first_name)]}
     return name
 
 
+# Keys of the parts of a name in the order they are written.
+NAME_PARTS = ("first", "von", "last", "jr")
+
+
 def name_dict_to_str(name: dict) -> str:
     """
     Concatenate the name information into a string.
     """
-    first = " ".join(name.get("first", []))
-    von = " ".join(name.get("von", []))
-    last = " ".join(name.get("last", []))
-    jr = " ".join(name.get("jr", []))
-    previous = first != ""
-    if previous and von:
-        von = f" {von}"
-    if previous and last:
-        last = f" {last}"
-    if previous and jr:
-        jr = f" {jr}"
-    return f"{first}{von}{last}{jr}"
+    return " ".join(
+        part for part in (" ".join(name.get(key, ())) for key in NAME_PARTS) if part
+    )
 
 
 def config_special_names(config) -> dict[str, str]:
@@ -77,12 +82,16 @@ def config_special_names(config) -> dict[str, str]:
     return special_names
 
 
+# Fields of an entry holding lists of people names.
+NAME_FIELDS = ("author", "editor")
+
 CONFIG = tomllib.load(
     open(os.path.join(os.path.dirname(__file__), "config_authfmt.toml"), "rb")
 )
 CONFIG_SPECIAL_NAMES = config_special_names(CONFIG)
 
 
+@lru_cache(maxsize=None)
 def format_name(name: str) -> str:
     """
     Format the given string containing a person name.
@@ -92,6 +101,7 @@ def format_name(name: str) -> str:
     return name_dict_to_str(format_name_dict(splitname(name)))
 
 
+@lru_cache(maxsize=None)
 def format_names(names: str) -> str:
     """
     Format the given string containing people names.
@@ -102,12 +112,18 @@ def format_names(names: str) -> str:
 def format_entry_names(entry):
     """
     Format the names in the given entry.
-    """
-    new_entry = entry.copy()
-    if "author" in new_entry:
-        new_entry["author"] = format_names(new_entry["author"])
-    if "editor" in entry:
-        new_entry["editor"] = format_names(entry["editor"])
+
+    The given entry is returned as is if no names change, otherwise a copy.
+    """
+    new_entry = entry
+    for field in NAME_FIELDS:
+        if field not in entry:
+            continue
+        names = format_names(entry[field])
+        if names != entry[field]:
+            if new_entry is entry:
+                new_entry = entry.copy()
+            new_entry[field] = names
     return new_entry
 
 
@@ -123,16 +139,14 @@ def format_bib(path):
     Format the given bibliography file.
     """
     # read bibliography
-    with open(path, "r") as f:
+    with open(path, "r", encoding="utf-8") as f:
         db = bp.load(f, _parser(customization=format_entry))
 
     # write the bibliography
-    with open(path, "w") as f:
-        bp.dump(db, f, _writer(sorted_entries=False))
+    _write_bib(db, path, _writer(sorted_entries=False))
 
 
 if __name__ == "__main__":
     check_min_version()
-    format_bib("krr.bib")
-    format_bib("procs.bib")
+    _map_files(format_bib, ("krr.bib", "procs.bib"))
     sys.exit(0)
@@ -4,11 +4,14 @@ Script using the bibtexparser module to cleanup_record and pretty print our
 bibliography.
 """
 
+import os
 import sys
+import shutil
 from io import StringIO
 from argparse import ArgumentParser
-from difflib import ndiff
-from collections import OrderedDict
+from difflib import unified_diff
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 import bibtexparser as bp
 from bibtexparser.bibdatabase import BibDataStringExpression
@@ -26,62 +29,60 @@ def check_min_version():
         raise RuntimeError("The script requires at least bibtexparser version 1.2.")
 
 
-def is_ascii(x):
-    """
-    Reurn true if the given string contains ascii symbols only.
-    """
-    try:
-        x.encode("ascii")
-        return True
-    except UnicodeEncodeError:
-        return False
-
-
-# Map from unicode symbols to latex expressions.
+# Map from the codepoints of unicode symbols to latex expressions.
 #
-# The bibtexparser.latexenc module also maps some ascii characters to unicode
-# symbols. Such characters are ignored in the map.
+# The map is meant to be used with str.translate. The bibtexparser.latexenc
+# module also maps some ascii characters to unicode symbols. Such characters
+# are ignored in the map. The same holds for its few entries for combining
+# sequences, which cannot be translated character by character.
 UNICODE_TO_LATEX = {
-    key: value for key, value in unicode_to_latex_map.items() if not is_ascii(key)
+    ord(key): value
+    for key, value in unicode_to_latex_map.items()
+    if len(key) == 1 and ord(key) > 127
 }
 
 
-def apply_on_expression(x, f):
-    """
-    Apply the function f for converting strings to bibtex expressions as
-    returned by the bibtexparser module.
-    """
-    if isinstance(x, str):
-        return f(x)
-    if isinstance(x, BibDataStringExpression):
-        x.apply_on_strings(f)
-    return x
-
-
+@lru_cache(maxsize=None)
 def cleanup_expression(x):
     """
     Convert the given string containing unicode symbols into a string with
     latex escapes only.
     """
-    ret = []
-    for char in x:
-        if char in (" ", "{", "}"):
-            ret.append(char)
-        else:
-            ret.append(UNICODE_TO_LATEX.get(char, char))
-    return "".join(ret)
+    if x.isascii():
+        return x
+    return x.translate(UNICODE_TO_LATEX)
+
+
+# Spellings of the pages field.
+#
+# The parser lower cases field names, the other spellings are kept for records
+# constructed by other means.
+PAGES_KEYS = frozenset(("pages", "Pages", "PAGES"))
+
+# Field values shorter than this are interned.
+INTERN_MAX_LENGTH = 64
 
 
 def cleanup_record(x):
     """
     Cleanup a record as returned by the bibtexparser module.
     """
-    for val in x:
-        if val in ("ID",):
-            continue
-        x[val] = apply_on_expression(x[val], cleanup_expression)
-        if val.lower() == "pages":
-            x[val] = x[val].replace("--", "-")
+    for key, val in x.items():
+        new_val = val
+        if key != "ID":
+            if isinstance(val, str):
+                # ascii strings need no cleanup
+                if not val.isascii():
+                    new_val = cleanup_expression(val)
+            elif isinstance(val, BibDataStringExpression):
+                val.apply_on_strings(cleanup_expression)
+            if key in PAGES_KEYS and "--" in new_val:
+                new_val = new_val.replace("--", "-")
+        # share short values like publishers and years between records
+        if isinstance(new_val, str) and len(new_val) < INTERN_MAX_LENGTH:
+            new_val = sys.intern(new_val)
+        if new_val is not val:
+            x[key] = new_val
     return x
 
 
@@ -110,40 +111,84 @@ def _fixdb(db):
     """
     Currently sorts the strings in the database.
     """
-    db.strings = OrderedDict(sorted(db.strings.items()))
+    db.strings = dict(sorted(db.strings.items()))
     return db
 
 
+def _write_bib(db, path, writer):
+    """
+    Write the database to the given bibliography file.
+
+    The output is written to a temporary file first, which then atomically
+    replaces the original file keeping its permissions. This way an error
+    while writing cannot leave a truncated bibliography behind. The temporary
+    file is removed if writing fails.
+    """
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            bp.dump(db, f, writer)
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
 def format_bib(path):
     """
     Format the given bibliography file.
     """
     # read bibliography
-    with open(path, "r") as f:
+    with open(path, "r", encoding="utf-8") as f:
         db = _fixdb(bp.load(f, _parser()))
 
     # write the bibliography
-    with open(path, "w") as f:
-        bp.dump(db, f, _writer())
+    _write_bib(db, path, _writer())
 
 
 def check_bib(path):
     """
     Check if the given bibliography is correctly formatted.
+
+    Returns the lines of a unified diff between the file and its formatted
+    version, which is empty if the file is correctly formatted.
     """
     # read bibliography
-    with open(path, "r") as f:
+    with open(path, "r", encoding="utf-8") as f:
         in_ = f.read()
 
     db = _fixdb(bp.loads(in_, _parser()))
 
     # write the bibliography
-    out = StringIO()
-    bp.dump(db, out, _writer())
+    with StringIO() as out:
+        bp.dump(db, out, _writer())
+        out_ = out.getvalue()
+    del db
 
-    return [
-        x for x in ndiff(in_.splitlines(), out.getvalue().splitlines()) if x[0] != " "
-    ]
+    if in_ == out_:
+        return []
+
+    in_lines = in_.splitlines()
+    out_lines = out_.splitlines()
+    if in_lines == out_lines:
+        return []
+
+    return list(
+        unified_diff(in_lines, out_lines, path, f"{path} (formatted)", n=0, lineterm="")
+    )
+
+
+def _map_files(func, paths):
+    """
+    Apply the given function to each bibliography file in a separate process.
+
+    The work is dominated by parsing, which is CPU bound and cannot be
+    parallelized within one file, so the files are processed concurrently.
+    """
+    with ProcessPoolExecutor(max_workers=len(paths)) as executor:
+        return list(executor.map(func, paths))
 
 
 def run():
@@ -165,13 +210,14 @@ def run():
 
     res = parser.parse_args()
 
+    paths = ("krr.bib", "procs.bib")
+
     if res.command == "format":
-        format_bib("krr.bib")
-        format_bib("procs.bib")
+        _map_files(format_bib, paths)
         return 0
 
     assert res.command == "check"
-    diff = check_bib("krr.bib") + check_bib("procs.bib")
+    diff = [x for lines in _map_files(check_bib, paths) for x in lines]
     if diff:
         for x in diff:
             print(x, file=sys.stderr)
@@ -1,5 +1,53 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
 import bibtexparser as bp
 
+# Characters separating the words of a name.
+_WHITESPACE = frozenset(" ~\r\n\t")
+
+# Characters that require the full latex aware splitting of a name.
+_LATEX_CHARS = frozenset("{}\\")
+
+# Matches the words and commas of a name without latex characters.
+_NAME_TOKEN_RE = re.compile(r"[^, ~\r\n\t]+|,", re.ASCII)
+
+
+def _word_case(word: str) -> int:
+    """
+    Return the case of the given word as determined by its first letter: 1 =
+    uppercase, 0 = lowercase, -1 = caseless.
+    """
+    for char in word:
+        if char.isalpha():
+            return 1 if char.isupper() else 0
+    return -1
+
+
+def is_plain_name(name: str) -> bool:
+    """
+    Return true if the given name can be split with split_plain_to_sections.
+    """
+    return name.isascii() and _LATEX_CHARS.isdisjoint(name) and name.count(",") < 3
+
+
+def split_plain_to_sections(name: str) -> tuple[list[list[str]], list[list[int]]]:
+    """
+    Split the given name into sections like split_latex_to_sections.
+
+    This is a fast path for the common case of plain ascii names without
+    braces and escapes as determined by is_plain_name.
+    """
+    sections = [[]]
+    for token in _NAME_TOKEN_RE.findall(name):
+        if token == ",":
+            sections.append([])
+        else:
+            sections[-1].append(token)
+    return sections, [[_word_case(word) for word in section] for section in sections]
+
 
 def split_latex_to_sections(
     latex_string: str, strict_mode=True
@@ -9,8 +57,6 @@ def split_latex_to_sections(
     Returns two lists of lists. Each list on the first of those two lists contains the words of a section.
     Each list on the second of those two lists contains the case of each word in the corresponding section: 1 = uppercase, 0 = lowercase, -1 = caseless.
     """
-    whitespace = set(" ~\r\n\t")
-
     # We'll iterate over the input once, dividing it into a list of words for
     # each comma-separated section. We'll also calculate the case of each word
     # as we work.
@@ -32,7 +78,7 @@ def split_latex_to_sections(
 
             # BibTeX doesn't allow whitespace escaping. Copy the slash and fall
             # through to the normal case to handle the whitespace.
-            if escaped in whitespace:
+            if escaped in _WHITESPACE:
                 word.append(char)
                 char = escaped
             else:
@@ -106,7 +152,7 @@ def split_latex_to_sections(
 
         # End of a word.
         # NB. we know we're not in a brace here due to the previous case.
-        if char == "," or char in whitespace:
+        if char == "," or char in _WHITESPACE:
             # Don't add empty words due to repeated whitespace.
             if word:
                 sections[-1].append("".join(word))
@@ -153,6 +199,7 @@ def split_latex_to_sections(
     return sections, cases
 
 
+@lru_cache(maxsize=None)
 def splitname(name, strict_mode=True):
     """
     Break a name into its constituent parts: First, von, Last, and Jr.
@@ -172,7 +219,8 @@ def splitname(name, strict_mode=True):
     returned dictionary has keys of ``first``, ``last``, ``von`` and ``jr``.
     Each value is a list of the words making up that part; this may be an empty
     list.  If the input has no non-whitespace characters, a blank dictionary is
-    returned.
+    returned. Results are cached, so the returned dictionary must not be
+    modified.
 
     It is capable of detecting some errors with the input name. If the
     ``strict_mode`` parameter is ``True``, which is the default, this results in
@@ -200,7 +248,10 @@ def splitname(name, strict_mode=True):
     #     name_parts = name_parts[1:] + name_parts[:1]
     #     name = ",".join(name_parts)
 
-    sections, cases = split_latex_to_sections(name, strict_mode)
+    if is_plain_name(name):
+        sections, cases = split_plain_to_sections(name)
+    else:
+        sections, cases = split_latex_to_sections(name, strict_mode)
 
     # Get rid of trailing sections.
     if not sections[-1]:
@@ -0,0 +1,71 @@
+"""
+Check that the fast path for plain names in splitnames agrees with the latex
+aware splitting.
+
+Run with `python -m unittest`.
+"""
+
+import os
+import random
+import unittest
+
+import bibtexparser as bp
+from bibfmt import _parser
+from splitnames import is_plain_name, split_latex_to_sections, split_plain_to_sections
+
+BIB_FILES = ("krr.bib", "procs.bib")
+
+
+def bib_names():
+    """
+    Return all author and editor names in the bibliography files.
+    """
+    names = set()
+    for path in BIB_FILES:
+        path = os.path.join(os.path.dirname(__file__), path)
+        with open(path, "r", encoding="utf-8") as f:
+            db = bp.load(f, _parser(customization=None))
+        for entry in db.entries:
+            for field in ("author", "editor"):
+                if isinstance(entry.get(field), str):
+                    names.update(entry[field].replace("\n", " ").split(" and "))
+    return names
+
+
+def random_names(n, seed=0):
+    """
+    Return n random names made of letters, dots, dashes, commas, and all
+    characters separating words.
+    """
+    rnd = random.Random(seed)
+    chars = "aAbB.-,, ~\r\n\t"
+    return [
+        "".join(rnd.choice(chars) for _ in range(rnd.randrange(16))) for _ in range(n)
+    ]
+
+
+class TestSplitPlainToSections(unittest.TestCase):
+    """
+    Compare split_plain_to_sections with split_latex_to_sections.
+    """
+
+    def assert_agree(self, names):
+        for name in names:
+            if not is_plain_name(name):
+                continue
+            with self.subTest(name=name):
+                for strict_mode in (True, False):
+                    self.assertEqual(
+                        split_plain_to_sections(name),
+                        split_latex_to_sections(name, strict_mode),
+                    )
+
+    def test_bib_names(self):
+        self.assert_agree(bib_names())
+
+    def test_random_names(self):
+        self.assert_agree(random_names(20000))
+
+
+if __name__ == "__main__":
+    unittest.main()